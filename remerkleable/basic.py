@@ -1,7 +1,12 @@
-from typing import Any, TypeVar, Type
-from remerkleable.core import BasicView, View, ObjType, ObjParseException
+from typing import Any, TypeVar, Type, Optional, List as PyList
+from struct import Struct, pack
+from remerkleable.core import BasicView, View, ViewHook, ObjType, ObjParseException, pack_bytes_to_chunks
+from remerkleable.tree import Node
 from remerkleable.settings import ENDIANNESS
 
+# struct byte-order prefix matching the configured endianness
+_STRUCT_ORDER = '<' if ENDIANNESS == 'little' else '>'
+
 V = TypeVar('V', bound=View)
 
 
@@ -23,6 +28,13 @@ class boolean(int, BasicView):
     def __new__(cls, value: int):  # int value, but can be any subclass of int (bool, Bit, Bool, etc...)
         if value < 0 or value > 1:
             raise ValueError(f"value {value} out of bounds for bit")
+        if cls is boolean:
+            # booleans are immutable, so the two possible values are shared instead of allocated every time.
+            # Other inputs, e.g. a float between 0 and 1, are converted by int as before.
+            if value == 1:
+                return _boolean_values[1]
+            if value == 0:
+                return _boolean_values[0]
         return super().__new__(cls, value)  # type: ignore
 
     def __add__(self, other):
@@ -51,6 +63,11 @@ class boolean(int, BasicView):
     def type_byte_length(cls) -> int:
         return 1
 
+    @classmethod
+    def pack_views(cls: Type[BoolV], views: PyList[BoolV]) -> PyList[Node]:
+        # a boolean is a 0 or 1 int, encoded as a single byte: bytes() packs them all at once.
+        return pack_bytes_to_chunks(bytes(views))
+
     @classmethod
     def decode_bytes(cls: Type[BoolV], bytez: bytes) -> BoolV:
         return cls(bytez != b"\x00")
@@ -69,6 +86,9 @@ class boolean(int, BasicView):
         return "boolean"
 
 
+_boolean_values = (int.__new__(boolean, 0), int.__new__(boolean, 1))
+
+
 T = TypeVar('T', bound="uint")
 W = TypeVar('W', bound=int)
 
@@ -76,13 +96,16 @@ W = TypeVar('W', bound=int)
 class uint(int, BasicView):
     __slots__ = ()
 
+    # Precompiled struct to (un)pack the uint with, if its byte length is natively supported by struct.
+    _struct: Optional[Struct] = None
+
     def __new__(cls, value: int):
         if value < 0:
             raise ValueError(f"unsigned type {cls} must not be negative")
         byte_len = cls.type_byte_length()
         if value.bit_length() > (byte_len << 3):
             raise ValueError(f"value out of bounds for {cls}")
-        return super().__new__(cls, value)  # type: ignore
+        return int.__new__(cls, value)
 
     def __add__(self: T, other: int) -> T:
         return self.__class__(super().__add__(self.__class__.coerce_view(other)))
@@ -193,11 +216,40 @@ class uint(int, BasicView):
 
     @classmethod
     def decode_bytes(cls: Type[T], bytez: bytes) -> T:
+        st = cls._struct
+        if st is not None and len(bytez) == st.size:
+            # Exactly the byte length of the type, so the value always fits and the bounds checks can be skipped.
+            return int.__new__(cls, st.unpack(bytez)[0])
         return cls(int.from_bytes(bytez, byteorder=ENDIANNESS))
 
     def encode_bytes(self) -> bytes:
+        st = self.__class__._struct
+        if st is not None:
+            return st.pack(self)
         return self.to_bytes(length=self.__class__.type_byte_length(), byteorder=ENDIANNESS)
 
+    @classmethod
+    def view_from_backing(cls: Type[T], node: Node, hook: Optional[ViewHook[T]] = None) -> T:
+        return cls.basic_view_from_backing(node, 0)
+
+    @classmethod
+    def pack_views(cls: Type[T], views: PyList[T]) -> PyList[Node]:
+        st = cls._struct
+        if st is not None:
+            # pack all values with a single struct call, then split the bytes into chunks.
+            return pack_bytes_to_chunks(pack(f"{_STRUCT_ORDER}{len(views)}{st.format[-1]}", *views))
+        byte_len = cls.type_byte_length()
+        return pack_bytes_to_chunks(b"".join([v.to_bytes(byte_len, byteorder=ENDIANNESS) for v in views]))
+
+    @classmethod
+    def basic_view_from_backing(cls: Type[T], node: Node, i: int) -> T:
+        st = cls._struct
+        if st is not None:
+            # unpack directly from the chunk, without slicing it first.
+            # The unpacked value always fits the type, so construct it without the bounds checks of __new__.
+            return int.__new__(cls, st.unpack_from(node.root, i * st.size)[0])
+        return super().basic_view_from_backing(node, i)
+
     @classmethod
     def from_obj(cls: Type[T], obj: ObjType) -> T:
         if not isinstance(obj, (int, str)):
@@ -219,6 +271,8 @@ class uint(int, BasicView):
 class uint8(uint):
     __slots__ = ()
 
+    _struct = Struct(_STRUCT_ORDER + 'B')
+
     @classmethod
     def type_byte_length(cls) -> int:
         return 1
@@ -227,6 +281,8 @@ class uint8(uint):
 class uint16(uint):
     __slots__ = ()
 
+    _struct = Struct(_STRUCT_ORDER + 'H')
+
     @classmethod
     def type_byte_length(cls) -> int:
         return 2
@@ -235,6 +291,8 @@ class uint16(uint):
 class uint32(uint):
     __slots__ = ()
 
+    _struct = Struct(_STRUCT_ORDER + 'I')
+
     @classmethod
     def type_byte_length(cls) -> int:
         return 4
@@ -243,6 +301,8 @@ class uint32(uint):
 class uint64(uint):
     __slots__ = ()
 
+    _struct = Struct(_STRUCT_ORDER + 'Q')
+
     @classmethod
     def type_byte_length(cls) -> int:
         return 8
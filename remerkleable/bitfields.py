@@ -1,24 +1,46 @@
-from typing import cast, BinaryIO, List as PyList, Any, TypeVar, Type
+from typing import BinaryIO, List as PyList, Any, TypeVar, Type, Optional, Iterable, Iterator
 from types import GeneratorType
 from collections.abc import Sequence as ColSequence
 import io
+from functools import lru_cache
 from remerkleable.core import BackedView, FixedByteLengthViewHelper, \
-    pack_bits_to_chunks, View, ObjType, ObjParseException
+    pack_bits_to_chunks, length_mixin_node, View, ObjType, ObjParseException
 from remerkleable.tree import Node, PairNode, zero_node, Gindex, to_gindex, Link, RootNode, NavigationError,\
-    Root, subtree_fill_to_contents, subtree_fill_to_length, get_depth
+    Root, subtree_fill_to_contents, subtree_fill_to_length, subtree_fill_from, subtree_bottom_nodes, get_depth
 from remerkleable.basic import boolean, uint256
-from remerkleable.readonly_iters import BitfieldIter
+from remerkleable.settings import ENDIANNESS
 
 V = TypeVar('V', bound=View)
 
 
 def _new_chunk_with_bit(chunk: Node, i: int, v: boolean) -> Node:
-    new_chunk_root = bytearray(bytes(chunk.root))  # mutable copy
-    if v:
-        new_chunk_root[(i & 0xff) >> 3] |= 1 << (i & 0x7)
-    else:
-        new_chunk_root[(i & 0xff) >> 3] &= (~(1 << (i & 0x7))) & 0xff
-    return RootNode(Root(new_chunk_root))
+    # Modify the chunk as a single 256 bit integer, the first bit is the lowest bit of the first byte.
+    chunk_int = int.from_bytes(chunk.root, byteorder='little')
+    mask = 1 << (i & 0xff)
+    chunk_int = (chunk_int | mask) if v else (chunk_int & ~mask)
+    return RootNode(Root(chunk_int.to_bytes(32, byteorder='little')))
+
+
+# The chunk with only the first bit set, shared between all bitlists. Nodes are immutable.
+_first_bit_chunk = RootNode(Root(b"\x01" + b"\x00" * 31))
+
+
+def _iter_bits(anchor: Node, depth: int, length: int) -> Iterator[bool]:
+    # Read every chunk once, and format it as 256 bits (first bit first), instead of extracting the bits one by one.
+    chunks = subtree_bottom_nodes(anchor, depth, (length + 255) >> 8)
+    bitstr = ''.join([format(int.from_bytes(chunk.root, byteorder='little'), '0256b')[::-1] for chunk in chunks])
+    return map('1'.__eq__, bitstr[:length])
+
+
+def _bits_bytes(anchor: Node, depth: int, length: int) -> bytes:
+    # The packed bits, without trailing bytes: the chunks are read in one traversal, and joined at once.
+    chunks = subtree_bottom_nodes(anchor, depth, (length + 255) >> 8)
+    return b"".join([chunk.root for chunk in chunks])[:(length + 7) >> 3]
+
+
+def _bits_str(bytez: bytes, length: int) -> str:
+    # Format the packed bits as one int, reversed so the first bit comes first. Ignores any bits past the length.
+    return format(int.from_bytes(bytez, byteorder='little'), f'0{len(bytez) * 8}b')[::-1][:length]
 
 
 # alike to the SubtreeView, but specialized to work on individual bits of chunks, instead of complex/basic types.
@@ -41,8 +63,7 @@ class BitsView(BackedView, ColSequence):
         i = int(i)  # coerce to int, access type can have stricter bit operation typing than necessary.
         if i >= ll:
             raise NavigationError(f"cannot get bit {i} in bits of length {ll}")
-        chunk_i = i >> 8
-        chunk = self.get_backing().getter(to_gindex(chunk_i, self.__class__.tree_depth()))
+        chunk = self._backing.getter(Gindex((1 << self.__class__.tree_depth()) | (i >> 8)))
         chunk_byte = chunk.root[(i & 0xff) >> 3]
         return boolean((chunk_byte >> (i & 0x7)) & 1)
 
@@ -51,9 +72,11 @@ class BitsView(BackedView, ColSequence):
         i = int(i)  # coerce to int, access type can have stricter bit operation typing than necessary.
         if i >= ll:
             raise NavigationError(f"cannot set bit {i} in bits of length {ll}")
-        chunk_i = i >> 8
-        chunk_setter_link: Link = self.get_backing().setter(to_gindex(chunk_i, self.__class__.tree_depth()))
-        chunk = self.get_backing().getter(to_gindex(chunk_i, self.__class__.tree_depth()))
+        # the bit index is in bounds, so the chunk gindex can be built inline.
+        target = Gindex((1 << self.__class__.tree_depth()) | (i >> 8))
+        backing = self._backing
+        chunk_setter_link: Link = backing.setter(target)
+        chunk = backing.getter(target)
         new_chunk = _new_chunk_with_bit(chunk, i & 0xff, v)
         self.set_backing(chunk_setter_link(new_chunk))
 
@@ -76,28 +99,58 @@ class BitsView(BackedView, ColSequence):
     def __setitem__(self, k, v):
         length = self.length()
         if type(k) == slice:
+            if k.step not in (None, 1):
+                raise Exception(f"slice-set with step {k.step} is not supported")
             i = 0 if k.start is None else k.start
+            if i < 0:
+                i += length
             end = length if k.stop is None else k.stop
-            for item in v:
-                self.set(i, item)
-                i += 1
-            if i != end:
+            if end < 0:
+                end += length
+            if i < 0 or end > length or i > end:
+                raise IndexError(f"slice [{k.start}:{k.stop}] out of range for length {length}")
+            bits = list(v)
+            if i + len(bits) != end:
                 raise Exception("failed to do full slice-set, not enough values")
+            # Write the bits chunk by chunk: one chunk lookup and rebind per 256 bits, instead of per bit.
+            depth = self.__class__.tree_depth()
+            backing = self._backing
+            bits_i = 0
+            while i < end:
+                chunk_end = min((i | 0xff) + 1, end)
+                target = Gindex((1 << depth) | (i >> 8))
+                chunk_int = int.from_bytes(backing.getter(target).root, byteorder='little')
+                for j in range(i & 0xff, ((chunk_end - 1) & 0xff) + 1):
+                    if bits[bits_i]:
+                        chunk_int |= 1 << j
+                    else:
+                        chunk_int &= ~(1 << j)
+                    bits_i += 1
+                backing = backing.setter(target)(RootNode(Root(chunk_int.to_bytes(32, byteorder='little'))))
+                i = chunk_end
+            self.set_backing(backing)
         else:
             self.set(k, v)
 
+    def count(self, value: Any) -> int:
+        # Count the set bits of the serialized bits at once, instead of iterating the bits one by one.
+        length = self.length()
+        bits_int = int.from_bytes(self.encode_bytes(), byteorder='little') & ((1 << length) - 1)  # drop delimiter
+        set_count = bin(bits_int).count('1')
+        if value == 1:
+            return set_count
+        if value == 0:
+            return length - set_count
+        return 0
+
     def encode_bytes(self) -> bytes:
         stream = io.BytesIO()
         self.serialize(stream)
-        stream.seek(0)
-        return stream.read()
+        return stream.getvalue()
 
     @classmethod
     def decode_bytes(cls: Type[V], bytez: bytes) -> V:
-        stream = io.BytesIO()
-        stream.write(bytez)
-        stream.seek(0)
-        return cls.deserialize(stream, len(bytez))
+        return cls.deserialize(io.BytesIO(bytez), len(bytez))
 
     @classmethod
     def from_obj(cls: Type[V], obj: ObjType) -> V:
@@ -117,7 +170,10 @@ class BitsView(BackedView, ColSequence):
 
 
 class Bitlist(BitsView):
-    __slots__ = ()
+    # The length is cached, like with List: None if unknown, reset when the backing is changed from the outside.
+    __slots__ = '_length',
+
+    _length: Optional[int]
 
     def __new__(cls, *args, **kwargs):
         vals = list(args)
@@ -127,14 +183,35 @@ class Bitlist(BitsView):
             limit = cls.limit()
             if len(vals) > limit:
                 raise Exception(f"too many bitlist inputs: {len(vals)}, limit is: {limit}")
-            input_bits = list(map(bool, vals))
-            input_nodes = pack_bits_to_chunks(input_bits)
+            input_nodes = pack_bits_to_chunks(vals)
             contents = subtree_fill_to_contents(input_nodes, cls.contents_depth())
-            kwargs['backing'] = PairNode(contents, uint256(len(input_bits)).get_backing())
-        return super().__new__(cls, **kwargs)
+            kwargs['backing'] = PairNode(contents, length_mixin_node(len(vals)))
+        out = super().__new__(cls, **kwargs)
+        out._length = None
+        return out
 
+    @classmethod
+    @lru_cache(maxsize=None)
     def __class_getitem__(cls, limit) -> Type["Bitlist"]:
+        contents_depth = get_depth((limit + 255) // 256)
+        tree_depth = contents_depth + 1  # 1 extra for length mix-in
+        default_node = PairNode(zero_node(contents_depth), zero_node(0))  # mix-in 0 as list length
+
         class SpecialBitlistView(Bitlist):
+            __slots__ = ()
+
+            @classmethod
+            def contents_depth(cls) -> int:
+                return contents_depth
+
+            @classmethod
+            def tree_depth(cls) -> int:
+                return tree_depth
+
+            @classmethod
+            def default_node(cls) -> Node:
+                return default_node
+
             @classmethod
             def limit(cls) -> int:
                 return limit
@@ -142,7 +219,7 @@ class Bitlist(BitsView):
         return SpecialBitlistView
 
     def __iter__(self):
-        return BitfieldIter(self.get_backing().get_left(), self.contents_depth(), self.length())
+        return _iter_bits(self._backing.get_left(), self.__class__.contents_depth(), self.length())
 
     @classmethod
     def contents_depth(cls) -> int:  # depth excluding the length mix-in
@@ -178,58 +255,87 @@ class Bitlist(BitsView):
         return (cls.limit() + 7 + 1) // 8
 
     def length(self) -> int:
-        ll_node = super().get_backing().get_right()
-        ll = cast(uint256, uint256.view_from_backing(node=ll_node, hook=None))
-        return int(ll)
+        length = self._length
+        if length is None:
+            # decode the uint256 length mix-in directly, without building a view for it
+            length = self._length = int.from_bytes(self._backing.get_right().root, byteorder=ENDIANNESS)
+        return length
+
+    def set_backing(self, value):
+        self._length = None
+        super().set_backing(value)
 
     def append(self, v: boolean):
         ll = self.length()
         if ll >= self.__class__.limit():
             raise Exception("list is maximum capacity, cannot append")
         i = ll
-        chunk_i = i // 256
-        target: Gindex = to_gindex(chunk_i, self.__class__.tree_depth())
+        # modify the contents, and then combine them with the new length into the new root.
+        target = Gindex((1 << self.__class__.contents_depth()) | (i >> 8))
+        contents = self._backing.get_left()
         if i & 0xff == 0:
-            set_last = self.get_backing().setter(target, expand=True)
-            next_backing = set_last(_new_chunk_with_bit(zero_node(0), 0, v))
+            set_last = contents.setter(target, expand=True)
+            # a new chunk only has the first bit, if any.
+            contents = set_last(_first_bit_chunk if v else zero_node(0))
         else:
-            set_last = self.get_backing().setter(target)
-            chunk = self.get_backing().getter(target)
-            next_backing = set_last(_new_chunk_with_bit(chunk, i & 0xff, v))
-        set_length = next_backing.rebind_right
-        new_length = uint256(ll + 1).get_backing()
-        next_backing = set_length(new_length)
+            set_last = contents.setter(target)
+            chunk = contents.getter(target)
+            contents = set_last(_new_chunk_with_bit(chunk, i & 0xff, v))
+        self.set_backing(PairNode(contents, length_mixin_node(ll + 1)))
+        self._length = ll + 1
+
+    def extend(self, values: Iterable[bool]):
+        """Append all the bits, building the new chunks in batch (see subtree_fill_from),
+         instead of one setter per bit."""
+        ll = self.length()
+        cls = self.__class__
+        bits = list(map(bool, values))
+        if len(bits) == 0:
+            return
+        new_length = ll + len(bits)
+        if new_length > cls.limit():
+            raise Exception(f"bitlist has not enough capacity: {ll} + {len(bits)} exceeds limit {cls.limit()}")
+        next_backing = self._backing
+        offset = ll & 0xff
+        if offset != 0:
+            # complete the last partially filled chunk first, the bits past the length are zero.
+            fill_count = min(256 - offset, len(bits))
+            target = Gindex((1 << cls.tree_depth()) | (ll >> 8))
+            chunk_int = int.from_bytes(next_backing.getter(target).root, byteorder='little')
+            for j in range(fill_count):
+                if bits[j]:
+                    chunk_int |= 1 << (offset + j)
+            next_backing = next_backing.setter(target)(RootNode(Root(chunk_int.to_bytes(32, byteorder='little'))))
+            bits = bits[fill_count:]
+        contents = subtree_fill_from(next_backing.get_left(), cls.contents_depth(), (ll + 255) >> 8,
+                                     pack_bits_to_chunks(bits))
+        next_backing = next_backing.rebind_left(contents).rebind_right(length_mixin_node(new_length))
         self.set_backing(next_backing)
+        self._length = new_length
 
     def pop(self):
         ll = self.length()
         if ll == 0:
             raise Exception("list is empty, cannot pop")
         i = ll - 1
-        chunk_i = i // 256
-        target: Gindex = to_gindex(chunk_i, self.__class__.tree_depth())
-        if i & 0xff == 0:
-            set_last = self.get_backing().setter(target)
-            next_backing = set_last(zero_node(0))
+        target = Gindex((1 << self.__class__.contents_depth()) | (i >> 8))
+        contents = self._backing.get_left()
+        chunk: Node
+        # if possible, summarize: only when the chunk became empty, the non-empty chunks must stay expanded for appends.
+        if (target & 1) == 0 and i & 0xff == 0:
+            # Summarize to the highest node possible: a left-hand node, or the contents root.
+            # All the bits from the popped one onwards are zero now, and the popped bit is the first of that subtree,
+            # so the summary is the zero node of the subtree height.
+            height = min((target & -target).bit_length() - 1, target.bit_length() - 1)
+            target >>= height
+            chunk = zero_node(height)
+        elif i & 0xff == 0:
+            chunk = zero_node(0)
         else:
-            set_last = self.get_backing().setter(target)
-            chunk = self.get_backing().getter(target)
-            next_backing = set_last(_new_chunk_with_bit(chunk, ll & 0xff, boolean(False)))
-
-        # if possible, summarize
-        can_summarize = (target & 1) == 0
-        if can_summarize:
-            # summarize to the highest node possible.
-            # I.e. the resulting target must be a right-hand, unless it's the only content node.
-            while (target & 1) == 0 and target != 0b10:
-                target >>= 1
-            summary_fn = next_backing.summarize_into(target)
-            next_backing = summary_fn()
-
-        set_length = next_backing.rebind_right
-        new_length = uint256(ll - 1).get_backing()
-        next_backing = set_length(new_length)
-        self.set_backing(next_backing)
+            chunk = _new_chunk_with_bit(contents.getter(target), i & 0xff, boolean(False))
+        contents = contents.setter(target)(chunk)
+        self.set_backing(PairNode(contents, length_mixin_node(ll - 1)))
+        self._length = ll - 1
 
     def get(self, i: int) -> boolean:
         if i < 0 or i >= self.length():
@@ -253,7 +359,7 @@ class Bitlist(BitsView):
         except NavigationError:
             return f"Bitlist[{self.__class__.limit()}]~partial"
         try:
-            bitstr = ''.join('1' if self.get(i) else '0' for i in range(length))
+            bitstr = _bits_str(self.encode_bytes(), length)  # excludes the delimiting bit
         except NavigationError:
             bitstr = " *partial bits* "
         return f"Bitlist[{self.__class__.limit()}]({length} bits: {bitstr})"
@@ -264,10 +370,7 @@ class Bitlist(BitsView):
 
     @classmethod
     def decode_bytes(cls: Type[V], bytez: bytes) -> V:
-        stream = io.BytesIO()
-        stream.write(bytez)
-        stream.seek(0)
-        return cls.deserialize(stream, len(bytez))
+        return cls.deserialize(io.BytesIO(bytez), len(bytez))
 
     @classmethod
     def deserialize(cls: Type[V], stream: BinaryIO, scope: int) -> V:
@@ -295,34 +398,19 @@ class Bitlist(BitsView):
         if bitlen > cls.limit():
             raise Exception(f"bitlist too long: {bitlen}, delimiting bit is over limit ({cls.limit()})")
         contents = subtree_fill_to_contents(chunks, cls.contents_depth())
-        backing = PairNode(contents, uint256(bitlen).get_backing())
+        backing = PairNode(contents, length_mixin_node(bitlen))
         return cls.view_from_backing(backing)
 
     def serialize(self, stream: BinaryIO) -> int:
-        backing = self.get_backing()
         bitlen = self.length()
-        chunk_count = (bitlen + 255) // 256  # excludes delimit bit, this is the backing, not the serialized form
-        byte_len = (bitlen + 7) // 8
-        tree_depth = self.tree_depth()
-        full_chunks_count = max(0, chunk_count - 1)
-        for chunk_index in range(full_chunks_count):
-            chunk = backing.getter(to_gindex(chunk_index, tree_depth))
-            stream.write(chunk.root)
-        if chunk_count > 0:
-            last_chunk = backing.getter(to_gindex(chunk_count - 1, tree_depth))
-            # write the last chunk, may not be a full chunk
-            last_chunk_bytes_count = byte_len - (full_chunks_count * 32)
-            bytez = last_chunk.root[:last_chunk_bytes_count]
-            # add in delimiting bit
-            if bitlen % 8 == 0:
-                bytez += b"\x01"
-            else:
-                bytez = bytez[:len(bytez) - 1] +\
-                        (bytez[len(bytez) - 1] ^ (1 << (bitlen % 8))).to_bytes(length=1, byteorder='little')
-            stream.write(bytez)
+        bytez = _bits_bytes(self.get_backing().get_left(), self.contents_depth(), bitlen)
+        # add in the delimiting bit: bits past the length are zero, so it is either in a new byte, or in the last byte.
+        if bitlen & 7 == 0:
+            bytez += b"\x01"
         else:
-            stream.write(b"\x01")  # empty bitlist still has a delimiting bit
-        return (bitlen + 7 + 1) // 8  # includes delimit bit in length computation
+            bytez = bytez[:-1] + bytes((bytez[-1] | (1 << (bitlen & 7)),))
+        stream.write(bytez)
+        return len(bytez)
 
     @classmethod
     def navigate_type(cls, key: Any) -> Type[View]:
@@ -354,16 +442,30 @@ class Bitvector(BitsView, FixedByteLengthViewHelper):
             veclen = cls.vector_length()
             if len(vals) != veclen:
                 raise Exception(f"incorrect bitvector input: {len(vals)} bits, vector length is: {veclen}")
-            input_bits = list(map(bool, vals))
-            input_nodes = pack_bits_to_chunks(input_bits)
+            input_nodes = pack_bits_to_chunks(vals)
             kwargs['backing'] = subtree_fill_to_contents(input_nodes, cls.tree_depth())
         return super().__new__(cls, **kwargs)
 
+    @classmethod
+    @lru_cache(maxsize=None)
     def __class_getitem__(cls, length) -> Type["Bitvector"]:
         if length <= 0:
             raise Exception(f"invalid bitvector length: {length}")
+        chunk_count = (length + 255) // 256
+        tree_depth = get_depth(chunk_count)
+        default_node = subtree_fill_to_length(zero_node(0), tree_depth, chunk_count)
 
         class SpecialBitvectorView(Bitvector):
+            __slots__ = ()
+
+            @classmethod
+            def tree_depth(cls) -> int:
+                return tree_depth
+
+            @classmethod
+            def default_node(cls) -> Node:
+                return default_node
+
             @classmethod
             def vector_length(cls) -> int:
                 return length
@@ -371,7 +473,7 @@ class Bitvector(BitsView, FixedByteLengthViewHelper):
         return SpecialBitvectorView
 
     def __iter__(self):
-        return BitfieldIter(self.get_backing(), self.__class__.tree_depth(), self.__class__.vector_length())
+        return _iter_bits(self._backing, self.__class__.tree_depth(), self.__class__.vector_length())
 
     @classmethod
     def tree_depth(cls) -> int:
@@ -409,7 +511,7 @@ class Bitvector(BitsView, FixedByteLengthViewHelper):
     def __repr__(self):
         length = self.length()
         try:
-            bitstr = ''.join('1' if self.get(i) else '0' for i in range(length))
+            bitstr = _bits_str(self.encode_bytes(), length)
         except NavigationError:
             bitstr = " *partial bits* "
         return f"Bitvector[{length}]({bitstr})"
@@ -435,21 +537,9 @@ class Bitvector(BitsView, FixedByteLengthViewHelper):
         return cls.view_from_backing(backing)
 
     def serialize(self, stream: BinaryIO) -> int:
-        backing = self.get_backing()
-        bitlen = self.length()
-        chunk_count = (bitlen + 255) // 256  # excludes delimit bit, this is the backing, not the serialized form
-        byte_len = (bitlen + 7) // 8
-        tree_depth = self.tree_depth()
-        full_chunks_count = max(0, chunk_count - 1)
-        for chunk_index in range(full_chunks_count):
-            chunk: Node = backing.getter(to_gindex(chunk_index, tree_depth))
-            stream.write(chunk.root)
-        if chunk_count > 0:
-            last_chunk = backing.getter(to_gindex(chunk_count - 1, tree_depth))
-            # write the last chunk, may not be a full chunk
-            last_chunk_bytes_count = byte_len - (full_chunks_count * 32)
-            stream.write(last_chunk.root[:last_chunk_bytes_count])
-        return byte_len
+        bytez = _bits_bytes(self.get_backing(), self.tree_depth(), self.length())
+        stream.write(bytez)
+        return len(bytez)
 
     @classmethod
     def navigate_type(cls, key: Any) -> Type[View]:
@@ -1,29 +1,35 @@
 from typing import Optional, Any, TypeVar, Type, BinaryIO
 from types import GeneratorType
+from functools import lru_cache
 from remerkleable.tree import Node, RootNode, Root, subtree_fill_to_contents, get_depth, to_gindex, \
-    subtree_fill_to_length, Gindex, PairNode
+    subtree_fill_to_length, subtree_bottom_nodes, Gindex, PairNode
 from remerkleable.core import View, ViewHook, zero_node, FixedByteLengthViewHelper, pack_bytes_to_chunks, ObjType, \
-    ObjParseException
-from remerkleable.basic import byte, uint256
+    ObjParseException, length_mixin_node
+from remerkleable.basic import byte
+from remerkleable.settings import ENDIANNESS
 
 
 RV = TypeVar('RV', bound="RawBytesView")
 
 
 class RawBytesView(bytes, View):
+    __slots__ = ()
+
     def __new__(cls, *args, **kwargs):
         if len(args) == 0:
             return super().__new__(cls, cls.default_bytes(), **kwargs)
         elif len(args) == 1:
             args = args[0]
-            if isinstance(args, (GeneratorType, list, tuple)):
+            if type(args) is bytes:  # super common case: a plain bytes value, e.g. a hash output
+                data = args
+            elif isinstance(args, (GeneratorType, list, tuple)):
                 data = bytes(args)
             elif isinstance(args, bytes):
                 data = args
             elif isinstance(args, str):
                 if args[:2] == '0x':
                     args = args[2:]
-                data = list(bytes.fromhex(args))
+                data = bytes.fromhex(args)
             else:
                 data = bytes(args)
             return super().__new__(cls, data, **kwargs)
@@ -75,6 +81,8 @@ BV = TypeVar('BV', bound="ByteVector")
 
 
 class ByteVector(RawBytesView, FixedByteLengthViewHelper, View):
+    __slots__ = ()
+
     def __new__(cls, *args, **kwargs):
         byte_len = cls.vector_length()
         out = super().__new__(cls, *args, **kwargs)
@@ -82,11 +90,15 @@ class ByteVector(RawBytesView, FixedByteLengthViewHelper, View):
             raise Exception(f"incorrect byte length: {len(out)}, expected {byte_len}")
         return out
 
+    @classmethod
+    @lru_cache(maxsize=None)
     def __class_getitem__(cls, length) -> Type["ByteVector"]:
         chunk_count = (length + 31) // 32
         tree_depth = get_depth(chunk_count)
 
         class SpecialByteVectorView(ByteVector):
+            __slots__ = ()
+
             @classmethod
             def default_node(cls) -> Node:
                 return subtree_fill_to_length(zero_node(0), tree_depth, chunk_count)
@@ -121,7 +133,7 @@ class ByteVector(RawBytesView, FixedByteLengthViewHelper, View):
             return cls.decode_bytes(node.merkle_root()[:byte_len])
         else:
             chunk_count = (byte_len + 31) // 32
-            chunks = [node.getter(to_gindex(i, depth)) for i in range(chunk_count)]
+            chunks = subtree_bottom_nodes(node, depth, chunk_count)
             bytez = b"".join(ch.merkle_root() for ch in chunks)[:byte_len]
             return cls.decode_bytes(bytez)
 
@@ -135,7 +147,7 @@ class ByteVector(RawBytesView, FixedByteLengthViewHelper, View):
 
     @classmethod
     def navigate_type(cls, key: Any) -> Type[View]:
-        if key < 0 or key > cls.vector_length():
+        if key < 0 or key >= cls.vector_length():
             raise KeyError
         return byte
 
@@ -172,11 +184,15 @@ class ByteList(RawBytesView, FixedByteLengthViewHelper, View):
             raise Exception(f"incorrect byte length: {len(out)}, cannot be more than limit {byte_limit}")
         return out
 
+    @classmethod
+    @lru_cache(maxsize=None)
     def __class_getitem__(cls, limit) -> Type["ByteList"]:
         chunk_count = (limit + 31) // 32
         contents_depth = get_depth(chunk_count)
 
         class SpecialByteListView(ByteList):
+            __slots__ = ()
+
             @classmethod
             def contents_depth(cls) -> int:
                 return contents_depth
@@ -203,21 +219,21 @@ class ByteList(RawBytesView, FixedByteLengthViewHelper, View):
     def view_from_backing(cls: Type[BL], node: Node, hook: Optional[ViewHook] = None) -> BL:
         contents_depth = cls.contents_depth()
         contents_node = node.get_left()
-        length = uint256.view_from_backing(node.get_right())
+        length = int.from_bytes(node.get_right().root, byteorder=ENDIANNESS)
         if length > cls.limit():
             raise Exception("ByteList backing declared length exceeds limit")
         if contents_depth == 0:
             return cls.decode_bytes(contents_node.root[:length])
         else:
             chunk_count = (length + 31) // 32
-            chunks = [contents_node.getter(to_gindex(i, contents_depth)) for i in range(chunk_count)]
+            chunks = subtree_bottom_nodes(contents_node, contents_depth, chunk_count)
             bytez = b"".join(ch.root for ch in chunks)[:length]
             return cls.decode_bytes(bytez)
 
     def get_backing(self) -> Node:
         return PairNode(
             subtree_fill_to_contents(pack_bytes_to_chunks(self), self.__class__.contents_depth()),
-            uint256(len(self)).get_backing()
+            length_mixin_node(len(self))
         )
 
     @classmethod
@@ -234,7 +250,7 @@ class ByteList(RawBytesView, FixedByteLengthViewHelper, View):
 
     @classmethod
     def navigate_type(cls, key: Any) -> Type[View]:
-        if key < 0 or key > cls.limit():
+        if key < 0 or key >= cls.limit():
             raise KeyError
         return byte
 
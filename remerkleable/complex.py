@@ -1,15 +1,20 @@
 from typing import NamedTuple, cast, List as PyList, Dict, Any, BinaryIO, Optional,\
-    TypeVar, Type, Protocol, runtime_checkable
+    TypeVar, Type, Protocol, runtime_checkable, ClassVar, Iterable
 from types import GeneratorType
 from textwrap import indent
 from collections.abc import Sequence as ColSequence
 from itertools import chain
 import io
-from remerkleable.core import View, BasicView, OFFSET_BYTE_LENGTH, ViewHook, ObjType, ObjParseException
-from remerkleable.basic import uint256, uint8, uint32
-from remerkleable.tree import Node, subtree_fill_to_length, subtree_fill_to_contents,\
-    zero_node, Gindex, PairNode, to_gindex, NavigationError, get_depth, RIGHT_GINDEX
+from functools import lru_cache
+from struct import unpack
+from remerkleable.core import View, BasicView, OFFSET_BYTE_LENGTH, ViewHook, ObjType, ObjParseException, \
+    length_mixin_node, pack_bytes_to_chunks
+from remerkleable.basic import boolean, uint, uint256, uint8, uint32
+from remerkleable.tree import Node, subtree_fill_to_length, subtree_fill_to_contents, subtree_fill_from,\
+    zero_node, Gindex, PairNode, RootNode, Root, to_gindex, NavigationError, get_depth, RIGHT_GINDEX, \
+    subtree_bottom_nodes
 from remerkleable.subtree import SubtreeView
+from remerkleable.settings import ENDIANNESS
 from remerkleable.readonly_iters import PackedIter, ComplexElemIter, ComplexFreshElemIter, ContainerElemIter
 
 V = TypeVar('V', bound=View)
@@ -29,15 +34,11 @@ class ComplexView(SubtreeView):
     def encode_bytes(self) -> bytes:
         stream = io.BytesIO()
         self.serialize(stream)
-        stream.seek(0)
-        return stream.read()
+        return stream.getvalue()
 
     @classmethod
     def decode_bytes(cls: Type[V], bytez: bytes) -> V:
-        stream = io.BytesIO()
-        stream.write(bytez)
-        stream.seek(0)
-        return cls.deserialize(stream, len(bytez))
+        return cls.deserialize(io.BytesIO(bytez), len(bytez))
 
 
 M = TypeVar('M', bound="MonoSubtreeView")
@@ -89,9 +90,35 @@ class MonoSubtreeView(ColSequence, ComplexView):
     def is_valid_count(cls, count: int) -> bool:
         raise NotImplementedError
 
+    @classmethod
+    def backing_from_chunks(cls, chunks: PyList[Node], count: int) -> Node:
+        """Build the backing from the bottom chunks of the contents, holding the given count of elements."""
+        raise NotImplementedError
+
     def __iter__(self):
+        # Basic views are immutable and not hooked to the sequence, so the packed chunks can be walked once,
+        # instead of navigating the tree from the root and re-checking the bounds for every element.
+        if self.is_packed():
+            return self.readonly_iter()
         return iter(self.get(i) for i in range(self.length()))
 
+    def _packed_bytes(self) -> bytes:
+        # The serialized elements of a packed sequence: the chunks are read in one traversal, and joined at once.
+        byte_length = self.element_cls().type_byte_length() * self.length()
+        chunks = subtree_bottom_nodes(self.get_backing(), self.tree_depth(), (byte_length + 31) >> 5)
+        return b"".join([chunk.root for chunk in chunks])[:byte_length]
+
+    def count(self, value: Any) -> int:
+        elem_cls = self.element_cls()
+        if self.is_packed():
+            # Basic views compare as their int value, so the elements can be decoded and counted as plain ints at once.
+            if issubclass(elem_cls, (boolean, uint8)):
+                return tuple(self._packed_bytes()).count(value)
+            if issubclass(elem_cls, uint) and elem_cls._struct is not None:
+                st = elem_cls._struct
+                return unpack(f"{st.format[0]}{self.length()}{st.format[1:]}", self._packed_bytes()).count(value)
+        return super().count(value)
+
     def readonly_iter(self):
         tree_depth = self.tree_depth()
         length = self.length()
@@ -117,6 +144,12 @@ class MonoSubtreeView(ColSequence, ComplexView):
             count = scope // elem_byte_length
             if not cls.is_valid_count(count):
                 raise Exception(f"count {count} is invalid")
+            if cls.is_packed() and issubclass(elem_cls, uint):
+                # Any bytes are a valid uint, so the serialized values can be chunked as-is, without decoding each.
+                data = stream.read(scope)
+                if len(data) != scope:
+                    raise Exception(f"expected {scope} bytes, but only got {len(data)}")
+                return cls.view_from_backing(cls.backing_from_chunks(pack_bytes_to_chunks(data), count))
             return cls(elem_cls.deserialize(stream, elem_byte_length) for _ in range(count))  # type: ignore
         else:
             if scope == 0:
@@ -148,8 +181,8 @@ class MonoSubtreeView(ColSequence, ComplexView):
 
     def serialize(self, stream: BinaryIO) -> int:
         elem_cls = self.__class__.element_cls()
-        if issubclass(elem_cls, uint8):
-            out = bytes(iter(self))
+        if self.is_packed():
+            out = self._packed_bytes()
             stream.write(out)
             return len(out)
         if elem_cls.is_fixed_byte_length():
@@ -230,17 +263,33 @@ class MonoSubtreeView(ColSequence, ComplexView):
             length = self.length()
         except NavigationError:
             return f"{self.type_repr()}( *summary root, no length known* )"
+        basic_elems = issubclass(self.element_cls(), BasicView)
+        shortened = length > (64 if basic_elems else 8)
+        summary_length = (10 if basic_elems else 3)
         vals: Dict[int, View] = {}
         partial = False
-        for i in range(length):
+        if not shortened:
+            # Read all elements with a single traversal of the tree, if the tree is complete.
             try:
-                vals[i] = self.get(i)
+                if self.is_packed():
+                    vals = dict(enumerate(self.readonly_iter()))
+                else:
+                    # not the readonly iterator: it re-uses the same view for every complex element.
+                    elem_cls = self.element_cls()
+                    nodes = subtree_bottom_nodes(self.get_backing(), self.tree_depth(), length)
+                    vals = {i: elem_cls.view_from_backing(node) for i, node in enumerate(nodes)}
             except NavigationError:
-                partial = True
-                continue
-        basic_elems = isinstance(self.element_cls(), BasicView)
-        shortened = length > (64 if basic_elems else 8)
-        summary_length = (10 if basic_elems else 3)
+                vals = {}
+        if len(vals) != length:
+            vals = {}
+            # Only the elements around the omitted part are displayed, the others do not have to be read.
+            indices = chain(range(summary_length + 1), range(length - summary_length, length)) if shortened else range(length)
+            for i in indices:
+                try:
+                    vals[i] = self.get(i)
+                except NavigationError:
+                    partial = True
+                    continue
         seperator = ', ' if basic_elems else ',\n'
         contents = seperator.join(f"... {length - (summary_length * 2)} omitted ..."
                                   if (shortened and i == summary_length)
@@ -256,13 +305,19 @@ class MonoSubtreeView(ColSequence, ComplexView):
 
 
 class List(MonoSubtreeView):
-    __slots__ = ()
+    # The length is cached, to not decode the length mix-in on every access and bounds check.
+    # None if unknown, it is reset whenever the backing is changed from the outside.
+    __slots__ = '_length',
+
+    _length: Optional[int]
 
     def __new__(cls, *args, backing: Optional[Node] = None, hook: Optional[ViewHook] = None, **kwargs):
         if backing is not None:
             if len(args) != 0:
                 raise Exception("cannot have both a backing and elements to init List")
-            return super().__new__(cls, backing=backing, hook=hook, **kwargs)
+            out = super().__new__(cls, backing=backing, hook=hook, **kwargs)
+            out._length = None
+            return out
 
         elem_cls = cls.element_cls()
         vals = list(args)
@@ -271,27 +326,31 @@ class List(MonoSubtreeView):
             if isinstance(val, (GeneratorType, list, tuple)):
                 vals = list(val)
             if issubclass(elem_cls, uint8):
-                if isinstance(val, bytes):
-                    vals = list(val)
                 if isinstance(val, str):
                     if val[:2] == '0x':
                         val = val[2:]
-                    vals = list(bytes.fromhex(val))
+                    val = bytes.fromhex(val)
+                if isinstance(val, bytes):
+                    # bytes are already the packed form of uint8 elements: chunk them as-is, without a view per byte.
+                    if len(val) > 0:
+                        limit = cls.limit()
+                        if len(val) > limit:
+                            raise Exception(f"too many list inputs: {len(val)}, limit is: {limit}")
+                        backing = cls.backing_from_chunks(pack_bytes_to_chunks(val), len(val))
+                    vals = []
         if len(vals) > 0:
             limit = cls.limit()
             if len(vals) > limit:
                 raise Exception(f"too many list inputs: {len(vals)}, limit is: {limit}")
-            input_views = []
-            for el in vals:
-                if isinstance(el, View):
-                    input_views.append(el)
-                else:
-                    input_views.append(elem_cls.coerce_view(el))
-            input_nodes = cls.views_into_chunks(input_views)
-            contents = subtree_fill_to_contents(input_nodes, cls.contents_depth())
-            backing = PairNode(contents, uint256(len(input_views)).get_backing())
-        return super().__new__(cls, backing=backing, hook=hook, **kwargs)
+            # Check the class, not the instance: the View protocol subclass check is cached, the instance check is not.
+            input_views = [el if issubclass(el.__class__, View) else elem_cls.coerce_view(el) for el in vals]
+            backing = cls.backing_from_chunks(cls.views_into_chunks(input_views), len(input_views))
+        out = super().__new__(cls, backing=backing, hook=hook, **kwargs)
+        out._length = None
+        return out
 
+    @classmethod
+    @lru_cache(maxsize=None)
     def __class_getitem__(cls, params) -> Type["List"]:
         (element_type, limit) = params
         contents_depth = 0
@@ -303,7 +362,15 @@ class List(MonoSubtreeView):
         else:
             contents_depth = get_depth(limit)
 
+        default_node = PairNode(zero_node(contents_depth), zero_node(0))  # mix-in 0 as list length
+
         class SpecialListView(List):
+            __slots__ = ()
+
+            @classmethod
+            def default_node(cls) -> Node:
+                return default_node
+
             @classmethod
             def is_packed(cls) -> bool:
                 return packed
@@ -312,6 +379,10 @@ class List(MonoSubtreeView):
             def contents_depth(cls) -> int:
                 return contents_depth
 
+            @classmethod
+            def tree_depth(cls) -> int:
+                return contents_depth + 1  # 1 extra for length mix-in
+
             @classmethod
             def element_cls(cls) -> Type[View]:
                 return element_type
@@ -324,9 +395,15 @@ class List(MonoSubtreeView):
         return SpecialListView
 
     def length(self) -> int:
-        ll_node = super().get_backing().get_right()
-        ll = cast(uint256, uint256.view_from_backing(node=ll_node, hook=None))
-        return int(ll)
+        length = self._length
+        if length is None:
+            # decode the uint256 length mix-in directly, without building a view for it
+            length = self._length = int.from_bytes(self._backing.get_right().root, byteorder=ENDIANNESS)
+        return length
+
+    def set_backing(self, value):
+        self._length = None
+        super().set_backing(value)
 
     def value_byte_length(self) -> int:
         elem_cls = self.__class__.element_cls()
@@ -336,85 +413,128 @@ class List(MonoSubtreeView):
             return sum(OFFSET_BYTE_LENGTH + cast(View, el).value_byte_length() for el in iter(self))
 
     def append(self, v: View):
+        cls = self.__class__
         ll = self.length()
-        if ll >= self.__class__.limit():
+        if ll >= cls.limit():
             raise Exception("list is maximum capacity, cannot append")
         i = ll
-        elem_type: Type[View] = self.__class__.element_cls()
+        elem_type: Type[View] = cls.element_cls()
         if not isinstance(v, elem_type):
             v = elem_type.coerce_view(v)
-        target: Gindex
-        if self.__class__.is_packed():
-            next_backing = self.get_backing()
-            if isinstance(v, BasicView):
+        # Modify the contents subtree, and then combine it with the new length into the new root, all in one go.
+        # The index is in bounds, so the gindex within the contents is built inline.
+        anchor = 1 << cls.contents_depth()
+        contents = self._backing.get_left()
+        if cls.is_packed():
+            # v is an instance of elem_type by now (see SubtreeView.set on checking the type instead of the value)
+            if issubclass(elem_type, BasicView):
                 elems_per_chunk = 32 // elem_type.type_byte_length()
                 chunk_i = i // elems_per_chunk
-                target = to_gindex(chunk_i, self.__class__.tree_depth())
+                target = Gindex(anchor | chunk_i)
                 chunk: Node
                 if i % elems_per_chunk == 0:
-                    set_last = next_backing.setter(target, expand=True)
+                    set_last = contents.setter(target, expand=True)
                     chunk = zero_node(0)
                 else:
-                    set_last = next_backing.setter(target)
-                    chunk = next_backing.getter(target)
-                chunk = v.backing_from_base(chunk, i % elems_per_chunk)
-                next_backing = set_last(chunk)
+                    set_last = contents.setter(target)
+                    chunk = contents.getter(target)
+                chunk = cast(BasicView, v).backing_from_base(chunk, i % elems_per_chunk)
+                contents = set_last(chunk)
             else:
                 raise Exception("cannot append a packed element that is not a basic type")
         else:
-            target = to_gindex(i, self.__class__.tree_depth())
-            set_last = self.get_backing().setter(target, expand=True)
-            next_backing = set_last(v.get_backing())
+            set_last = contents.setter(Gindex(anchor | i), expand=True)
+            contents = set_last(v.get_backing())
+
+        self.set_backing(PairNode(contents, length_mixin_node(ll + 1)))
+        self._length = ll + 1
+
+    def extend(self, values: Iterable[View]):
+        """Append all the values, building the new parts of the tree in batch (see subtree_fill_from),
+         instead of one setter per element."""
+        ll = self.length()
+        cls = self.__class__
+        elem_type: Type[View] = cls.element_cls()
+        views = [v if isinstance(v, elem_type) else elem_type.coerce_view(v) for v in values]
+        if len(views) == 0:
+            return
+        new_length = ll + len(views)
+        if new_length > cls.limit():
+            raise Exception(f"list has not enough capacity: {ll} + {len(views)} exceeds limit {cls.limit()}")
+        tree_depth = cls.tree_depth()
+        next_backing = self.get_backing()
+        nodes: PyList[Node]
+        start: int
+        if cls.is_packed():
+            if not issubclass(elem_type, BasicView):
+                raise Exception("cannot append a packed element that is not a basic type")
+            elems_per_chunk = 32 // elem_type.type_byte_length()
+            offset = ll % elems_per_chunk
+            if offset != 0:
+                # complete the last partially filled chunk first
+                target = to_gindex(ll // elems_per_chunk, tree_depth)
+                chunk = next_backing.getter(target)
+                fill_count = min(elems_per_chunk - offset, len(views))
+                for j in range(fill_count):
+                    chunk = cast(BasicView, views[j]).backing_from_base(chunk, offset + j)
+                next_backing = next_backing.setter(target)(chunk)
+                views = views[fill_count:]
+            nodes = cls.views_into_chunks(views)
+            start = (ll + elems_per_chunk - 1) // elems_per_chunk
+        else:
+            nodes = [v.get_backing() for v in views]
+            start = ll
 
-        set_length = next_backing.rebind_right
-        new_length = uint256(ll + 1).get_backing()
-        next_backing = set_length(new_length)
+        contents = subtree_fill_from(next_backing.get_left(), tree_depth - 1, start, nodes)
+        next_backing = next_backing.rebind_left(contents)
+        next_backing = next_backing.rebind_right(length_mixin_node(new_length))
         self.set_backing(next_backing)
+        self._length = new_length
 
     def pop(self):
         ll = self.length()
         if ll == 0:
             raise Exception("list is empty, cannot pop")
         i = ll - 1
+        cls = self.__class__
+        anchor = 1 << cls.contents_depth()
+        contents = self._backing.get_left()
         target: Gindex
         can_summarize: bool
-        if self.__class__.is_packed():
-            next_backing = self.get_backing()
-            elem_type: Type[View] = self.__class__.element_cls()
+        chunk: Node
+        if cls.is_packed():
+            elem_type: Type[View] = cls.element_cls()
             if issubclass(elem_type, BasicView):
-                elems_per_chunk = 32 // elem_type.type_byte_length()
-                chunk_i = i // elems_per_chunk
-                target = to_gindex(chunk_i, self.__class__.tree_depth())
+                elem_byte_length = elem_type.type_byte_length()
+                elems_per_chunk = 32 // elem_byte_length
+                target = Gindex(anchor | (i // elems_per_chunk))
+                can_summarize = (target & 1) == 0 and i % elems_per_chunk == 0
                 if i % elems_per_chunk == 0:
                     chunk = zero_node(0)
                 else:
-                    chunk = next_backing.getter(target)
-                set_last = next_backing.setter(target)
-                chunk = elem_type.default(None).backing_from_base(chunk, i % elems_per_chunk)
-                next_backing = set_last(chunk)
-
-                can_summarize = (target & 1) == 0 and i % elems_per_chunk == 0
+                    # zero the bytes of the popped element, the last one in the chunk, without creating a default view.
+                    offset = (i % elems_per_chunk) * elem_byte_length
+                    chunk_bytes = contents.getter(target).root[:offset]
+                    chunk = RootNode(Root(chunk_bytes + b"\x00" * (32 - offset)))
             else:
                 raise Exception("cannot pop a packed element that is not a basic type")
         else:
-            target = to_gindex(i, self.__class__.tree_depth())
-            set_last = self.get_backing().setter(target)
-            next_backing = set_last(zero_node(0))
+            target = Gindex(anchor | i)
             can_summarize = (target & 1) == 0
+            chunk = zero_node(0)
 
         # if possible, summarize
         if can_summarize:
-            # summarize to the highest node possible.
-            # I.e. the resulting target must be a right-hand, unless it's the only content node.
-            while (target & 1) == 0 and target != 0b10:
-                target >>= 1
-            summary_fn = next_backing.summarize_into(target)
-            next_backing = summary_fn()
-
-        set_length = next_backing.rebind_right
-        new_length = uint256(ll - 1).get_backing()
-        next_backing = set_length(new_length)
-        self.set_backing(next_backing)
+            # Summarize to the highest node possible: a left-hand node, or the contents root.
+            # The popped element is the first of that subtree, and everything from there on is zero now,
+            # so the summary is the zero node of the subtree height. Shift out the trailing zero bits at once.
+            height = min((target & -target).bit_length() - 1, target.bit_length() - 1)
+            target >>= height
+            chunk = zero_node(height)
+        contents = contents.setter(target)(chunk)
+
+        self.set_backing(PairNode(contents, length_mixin_node(ll - 1)))
+        self._length = ll - 1
 
     def get(self, i: int) -> View:
         i = int(i)
@@ -459,6 +579,10 @@ class List(MonoSubtreeView):
     def is_valid_count(cls, count: int) -> bool:
         return 0 <= count <= cls.limit()
 
+    @classmethod
+    def backing_from_chunks(cls, chunks: PyList[Node], count: int) -> Node:
+        return PairNode(subtree_fill_to_contents(chunks, cls.contents_depth()), length_mixin_node(count))
+
     @classmethod
     def navigate_type(cls, key: Any) -> Type[View]:
         if key == '__len__':
@@ -515,26 +639,28 @@ class Vector(MonoSubtreeView):
             if isinstance(val, (GeneratorType, list, tuple)):
                 vals = list(val)
             if issubclass(elem_cls, uint8):
-                if isinstance(val, bytes):
-                    vals = list(val)
                 if isinstance(val, str):
                     if val[:2] == '0x':
                         val = val[2:]
-                    vals = list(bytes.fromhex(val))
+                    val = bytes.fromhex(val)
+                if isinstance(val, bytes):
+                    # bytes are already the packed form of uint8 elements: chunk them as-is, without a view per byte.
+                    if len(val) > 0:
+                        vector_length = cls.vector_length()
+                        if len(val) != vector_length:
+                            raise Exception(f"invalid inputs length: {len(val)}, vector length is: {vector_length}")
+                        backing = cls.backing_from_chunks(pack_bytes_to_chunks(val), len(val))
+                    vals = []
         if len(vals) > 0:
             vector_length = cls.vector_length()
             if len(vals) != vector_length:
                 raise Exception(f"invalid inputs length: {len(vals)}, vector length is: {vector_length}")
-            input_views = []
-            for el in vals:
-                if isinstance(el, View):
-                    input_views.append(el)
-                else:
-                    input_views.append(elem_cls.coerce_view(el))
-            input_nodes = cls.views_into_chunks(input_views)
-            backing = subtree_fill_to_contents(input_nodes, cls.tree_depth())
+            input_views = [el if issubclass(el.__class__, View) else elem_cls.coerce_view(el) for el in vals]
+            backing = cls.backing_from_chunks(cls.views_into_chunks(input_views), len(input_views))
         return super().__new__(cls, backing=backing, hook=hook, **kwargs)
 
+    @classmethod
+    @lru_cache(maxsize=None)
     def __class_getitem__(cls, params) -> Type["Vector"]:
         (element_view_cls, length) = params
         if length <= 0:
@@ -542,14 +668,30 @@ class Vector(MonoSubtreeView):
 
         tree_depth = 0
         packed = False
+        default_node: Node
         if isinstance(element_view_cls, BasicView):
             elems_per_chunk = 32 // element_view_cls.type_byte_length()
-            tree_depth = get_depth((length + elems_per_chunk - 1) // elems_per_chunk)
+            chunk_count = (length + elems_per_chunk - 1) // elems_per_chunk
+            tree_depth = get_depth(chunk_count)
             packed = True
+            default_node = subtree_fill_to_length(zero_node(0), tree_depth, chunk_count)
         else:
             tree_depth = get_depth(length)
+            default_node = subtree_fill_to_length(element_view_cls.default_node(), tree_depth, length)
 
+        # for fixed-size vectors, pre-compute the size.
+        fixed_size = element_view_cls.is_fixed_byte_length()
+        byte_length = element_view_cls.type_byte_length() * length if fixed_size else 0
+
+        # A single class per vector type, the fixed-size overrides are only defined when applicable,
+        # to not extend the MRO with another layer.
         class SpecialVectorView(Vector):
+            __slots__ = ()
+
+            @classmethod
+            def default_node(cls) -> Node:
+                return default_node
+
             @classmethod
             def is_packed(cls) -> bool:
                 return packed
@@ -566,13 +708,7 @@ class Vector(MonoSubtreeView):
             def vector_length(cls) -> int:
                 return length
 
-        out_typ = SpecialVectorView
-
-        # for fixed-size vectors, pre-compute the size.
-        if element_view_cls.is_fixed_byte_length():
-            byte_length = element_view_cls.type_byte_length() * length
-
-            class FixedSpecialVectorView(SpecialVectorView):
+            if fixed_size:
                 @classmethod
                 def type_byte_length(cls) -> int:
                     return byte_length
@@ -585,10 +721,8 @@ class Vector(MonoSubtreeView):
                 def max_byte_length(cls) -> int:
                     return byte_length
 
-            out_typ = FixedSpecialVectorView
-
-        out_typ.__name__ = out_typ.type_repr()
-        return out_typ
+        SpecialVectorView.__name__ = SpecialVectorView.type_repr()
+        return SpecialVectorView
 
     def get(self, i: int) -> View:
         i = int(i)
@@ -626,6 +760,10 @@ class Vector(MonoSubtreeView):
     def is_valid_count(cls, count: int) -> bool:
         return count == cls.vector_length()
 
+    @classmethod
+    def backing_from_chunks(cls, chunks: PyList[Node], count: int) -> Node:
+        return subtree_fill_to_contents(chunks, cls.tree_depth())
+
     @classmethod
     def navigate_type(cls, key: Any) -> Type[View]:
         if key >= cls.vector_length():
@@ -694,6 +832,17 @@ class _ContainerLike(Protocol):
 CV = TypeVar('CV', bound="Container")
 
 
+class _FieldProperty(property):
+    """Property to read a container field by index. Generated for each field of a container type.
+     Fields are written through Container.__setattr__."""
+
+    def __init__(self, findex: int):
+        def get_field(view: SubtreeView) -> View:
+            return SubtreeView.get(view, findex)
+
+        super().__init__(get_field)
+
+
 class _ContainerBase(ComplexView):
     __slots__ = ()
 
@@ -716,8 +865,12 @@ class _ContainerBase(ComplexView):
 
 
 class Container(_ContainerBase):
-    _field_indices: Dict[str, int]
-    __slots__ = '_field_indices'
+    _fields: ClassVar[Fields] = {}
+    _field_indices: ClassVar[Dict[str, int]]
+    _field_types: ClassVar[PyList[Type[View]]]
+    _tree_depth: ClassVar[int]
+    _default_node: ClassVar[Optional[Node]]
+    __slots__ = ()
 
     def __new__(cls, *args, backing: Optional[Node] = None, hook: Optional[ViewHook] = None,
                 append_nodes: Optional[PyList[Node]] = None, **kwargs):
@@ -731,7 +884,8 @@ class Container(_ContainerBase):
             fnode: Node
             if fkey in kwargs:
                 finput = kwargs.pop(fkey)
-                if isinstance(finput, View):
+                # Check the class, not the instance: the View protocol subclass check is cached, the instance check is not.
+                if issubclass(finput.__class__, View):
                     fnode = finput.get_backing()
                 else:
                     fnode = ftyp.coerce_view(finput).get_backing()
@@ -751,9 +905,29 @@ class Container(_ContainerBase):
 
     def __init_subclass__(cls, *args, **kwargs):
         super().__init_subclass__(*args, **kwargs)
-        cls._field_indices = {fkey: i for i, fkey in enumerate(cls.fields())}
+        # Resolve the fields once, the annotations of a container type are not expected to change after creation.
+        fields = {}
+        for b in cls.__bases__:
+            for k, v in b.fields().items():
+                fields[k] = v
+        for k, v in cls.__annotations__.items():
+            if k[0] != '_':
+                fields[k] = v  # if the key exists, overwrite it. Otherwise it extends the (ordered) dict.
+        cls._fields = fields
+        cls._field_indices = {fkey: i for i, fkey in enumerate(fields)}
+        cls._field_types = list(fields.values())
         if len(cls._field_indices) == 0:
             raise Exception(f"Container {cls.__name__} must have at least one field!")
+        cls._tree_depth = get_depth(len(fields))
+        # built on first use, the field types may not all be ready to build their defaults yet.
+        cls._default_node = None
+        for fkey, findex in cls._field_indices.items():
+            # Methods and other class attributes keep precedence over a field property of the same name.
+            # Look up the definition, not the value: a class attribute may also be set to None.
+            owner = next((base for base in cls.__mro__ if fkey in vars(base)), None)
+            # A shadowed field can still be read with get(), and written by name through __setattr__.
+            if owner is None or isinstance(vars(owner)[fkey], _FieldProperty):
+                setattr(cls, fkey, _FieldProperty(findex))
 
     @classmethod
     def coerce_view(cls: Type[CV], v: Any) -> CV:
@@ -761,14 +935,7 @@ class Container(_ContainerBase):
 
     @classmethod
     def fields(cls) -> Fields:
-        fields = {}
-        for b in cls.__bases__:
-            for k, v in b.fields().items():
-                fields[k] = v
-        for k, v in cls.__annotations__.items():
-            if k[0] != '_':
-                fields[k] = v  # if the key exists, overwrite it. Otherwise it extends the (ordered) dict.
-        return fields
+        return cls._fields
 
     @classmethod
     def is_fixed_byte_length(cls) -> bool:
@@ -805,15 +972,19 @@ class Container(_ContainerBase):
 
     @classmethod
     def tree_depth(cls) -> int:
-        return get_depth(len(cls.fields()))
+        return cls._tree_depth
 
     @classmethod
     def item_elem_cls(cls, i: int) -> Type[View]:
-        return list(cls.fields().values())[i]
+        return cls._field_types[i]
 
     @classmethod
     def default_node(cls) -> Node:
-        return subtree_fill_to_contents([field.default_node() for field in cls.fields().values()], cls.tree_depth())
+        node = cls._default_node
+        if node is None:
+            node = cls._default_node = subtree_fill_to_contents(
+                [field.default_node() for field in cls.fields().values()], cls.tree_depth())
+        return node
 
     def value_byte_length(self) -> int:
         if self.__class__.is_fixed_byte_length():
@@ -829,17 +1000,9 @@ class Container(_ContainerBase):
                     total += cast(View, getattr(self, fkey)).value_byte_length()
             return total
 
-    def __getattr__(self, item):
-        if item[0] == '_':
-            return super().__getattribute__(item)
-        else:
-            try:
-                i = self.__class__._field_indices[item]
-            except KeyError:
-                raise AttributeError(f"unknown attribute {item}")
-            return super().get(i)
-
     def __setattr__(self, key, value):
+        # Fields are written by index, also when shadowed by a class attribute. Other public names are rejected,
+        # also for container types with an instance dict, where they would otherwise be accepted silently.
         if key[0] == '_':
             super().__setattr__(key, value)
         else:
@@ -873,14 +1036,11 @@ class Container(_ContainerBase):
     def __iter__(self):
         tree_depth = self.tree_depth()
         backing = self.get_backing()
-        return ContainerElemIter(backing, tree_depth, list(self.__class__.fields().values()))
+        return ContainerElemIter(backing, tree_depth, self.__class__._field_types)
 
     @classmethod
     def decode_bytes(cls: Type[V], bytez: bytes) -> V:
-        stream = io.BytesIO()
-        stream.write(bytez)
-        stream.seek(0)
-        return cls.deserialize(stream, len(bytez))
+        return cls.deserialize(io.BytesIO(bytez), len(bytez))
 
     @classmethod
     def deserialize(cls: Type[CV], stream: BinaryIO, scope: int) -> CV:
@@ -951,11 +1111,7 @@ class Container(_ContainerBase):
 
     @classmethod
     def key_to_static_gindex(cls, key: Any) -> Gindex:
-        fields = cls.fields()
-        try:
-            field_index = list(fields.keys()).index(key)
-        except ValueError:  # list.index raises ValueError if the element (a key here) is missing
-            raise KeyError
+        field_index = cls._field_indices[key]  # raises KeyError if the key is not a field
         return to_gindex(field_index, cls.tree_depth())
 
     @classmethod
@@ -963,7 +1119,11 @@ class Container(_ContainerBase):
         return cls.fields()[key]
 
     def navigate_view(self, key: Any) -> View:
-        return self.__getattr__(key)
+        try:
+            i = self.__class__._field_indices[key]
+        except KeyError:
+            raise AttributeError(f"unknown attribute {key}")
+        return self.get(i)
 
     def __eq__(self, other):
         if not isinstance(other, Container):
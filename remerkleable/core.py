@@ -88,7 +88,7 @@ ViewHook = Callable[[HV], None]
 
 @runtime_checkable
 class View(Protocol, metaclass=ViewMeta):
-    # __slots__ = ()  # disabled, mypy bug
+    __slots__ = ()
 
     @classmethod
     def coerce_view(cls: Type[V], v: Any) -> V:
@@ -96,6 +96,8 @@ class View(Protocol, metaclass=ViewMeta):
 
     @classmethod
     def default_node(cls) -> Node:
+        """The backing of the default value of the type.
+         Tree nodes are immutable, so it can be built once per type, and shared between all instances."""
         ...
 
     @classmethod
@@ -192,7 +194,7 @@ class View(Protocol, metaclass=ViewMeta):
 
 
 class FixedByteLengthViewHelper(View, Protocol):
-    # __slots__ = ()  # disabled, mypy bug
+    __slots__ = ()
 
     @classmethod
     def is_fixed_byte_length(cls) -> bool:
@@ -253,8 +255,7 @@ BV = TypeVar('BV', bound="BasicView")
 
 @runtime_checkable
 class BasicView(FixedByteLengthViewHelper, Protocol):
-    # __slots__ = ()  # mypy bug, warns about non-method member that is not really an attribute itself:
-    # "Only protocols that don't have non-method members can be used with issubclass()"
+    __slots__ = ()
 
     @classmethod
     def default_node(cls) -> Node:
@@ -283,8 +284,7 @@ class BasicView(FixedByteLengthViewHelper, Protocol):
         return RootNode(Root(chunk_bytez))
 
     def get_backing(self) -> Node:
-        bytez = self.encode_bytes()
-        return RootNode(Root(bytez + b"\x00" * (32 - len(bytez))))
+        return RootNode(Root(self.encode_bytes().ljust(32, b"\x00")))
 
     def set_backing(self, value):
         raise Exception("cannot change the backing of a basic view")
@@ -313,9 +313,18 @@ def byte_int_to_byte(b: int) -> bytes:
     return b.to_bytes(length=1, byteorder='little')
 
 
+# Translates bytes of 0 and 1 values to the binary digit characters
+_bit_digits = bytes.maketrans(b"\x00\x01", b"01")
+
+
 def pack_bits_to_chunks(items: Iterable[bool]) -> PyList[Node]:
-    # grouper returns tuples of N=8, bits_to_byte_int takes tuples of 8, but mypy does not follow.
-    return pack_byte_ints_to_chunks(map(bits_to_byte_int, grouper(items, 8, fillvalue=0)))  # type: ignore
+    # One byte per bit, any truthy item is a 1 bit.
+    bits = bytes(map(bool, items))
+    if len(bits) == 0:
+        return []
+    # Pack all bits into a single int at once (first bit is the lowest bit), instead of grouping them byte by byte.
+    bits_int = int(bits[::-1].translate(_bit_digits), 2)
+    return pack_bytes_to_chunks(bits_int.to_bytes(length=(len(bits) + 7) // 8, byteorder='little'))
 
 
 def pack_byte_ints_to_chunks(items: Iterable[int]) -> PyList[Node]:
@@ -323,6 +332,11 @@ def pack_byte_ints_to_chunks(items: Iterable[int]) -> PyList[Node]:
             for chunk_bytes in grouper(items, 32, fillvalue=0)]
 
 
+def length_mixin_node(length: int) -> Node:
+    """The length mix-in node of list-like types: the backing of uint256(length), built without the view."""
+    return RootNode(Root(length.to_bytes(32, byteorder=ENDIANNESS)))
+
+
 def pack_bytes_to_chunks(bytez: bytes) -> PyList[Node]:
     full_chunks_byte_len = (len(bytez) >> 5) << 5
     out: PyList[Node] = [RootNode(Root(bytez[i:i+32])) for i in range(0, full_chunks_byte_len, 32)]
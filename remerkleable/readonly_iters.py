@@ -5,7 +5,9 @@ from remerkleable.settings import ZERO_ROOT
 
 
 class BitfieldIter(object):
-    """Iterates a subtree by traversing it with a stack (thus readonly), returning bits"""
+    """Iterates a subtree by traversing it with a stack (thus readonly), returning bits.
+     Not used by the bitfield views themselves, which read their bits from the joined chunks at once,
+     but available to iterate the bits of any packed bits subtree without building a view."""
 
     anchor: Node
     depth: int
@@ -10,6 +10,7 @@ from remerkleable.bitfields import Bitvector, Bitlist
 from remerkleable.byte_arrays import ByteVector, ByteList
 from remerkleable.core import View, ObjType
 from remerkleable.union import Union
+from remerkleable.tree import merkle_hash, zero_node, subtree_fill_to_contents, subtree_bottom_nodes
 from hashlib import sha256
 
 import json
@@ -475,3 +476,28 @@ def test_container_equality():
     assert A(1, 2, 3) != B(1, 2, 3, 0)
     assert A(1, 2, 3) in {A(1, 2, 3)}
     assert A(1, 2, 3) not in {B(1, 2, 3, 0)}
+
+
+@pytest.mark.parametrize("count, depth", [
+    (0, 0), (1, 0), (0, 3), (1, 1), (2, 1), (3, 2), (4, 2), (5, 3), (7, 3), (8, 3), (9, 4), (13, 5)])
+def test_subtree_fill_to_contents(count: int, depth: int):
+    leaves = [uint256(i + 1).get_backing() for i in range(count)]
+    layer = [leaf.merkle_root() for leaf in leaves] + [zero_node(0).merkle_root()] * ((1 << depth) - count)
+    while len(layer) > 1:
+        layer = [merkle_hash(layer[i], layer[i + 1]) for i in range(0, len(layer), 2)]
+    assert subtree_fill_to_contents(leaves, depth).merkle_root() == layer[0]
+
+
+@pytest.mark.parametrize("count, depth", [(0, 0), (0, 3), (1, 0), (1, 3), (2, 1), (3, 2), (5, 3), (8, 3), (9, 4), (13, 5)])
+def test_subtree_bottom_nodes(count: int, depth: int):
+    leaves = [uint256(i + 1).get_backing() for i in range(count)]
+    node = subtree_fill_to_contents(leaves, depth)
+    assert [leaf.merkle_root() for leaf in subtree_bottom_nodes(node, depth, count)] == \
+        [leaf.merkle_root() for leaf in leaves]
+
+
+def test_zero_node_shared():
+    assert zero_node(0).merkle_root() == b"\x00" * 32
+    for depth in range(1, 64):
+        assert zero_node(depth) is zero_node(depth)
+        assert zero_node(depth).merkle_root() == merkle_hash(zero_node(depth - 1).root, zero_node(depth - 1).root)
@@ -3,14 +3,16 @@
 import pytest  # type: ignore
 
 from random import Random
+import weakref
 
 from remerkleable.complex import Container, Vector, List
 from remerkleable.basic import boolean, bit, uint, byte, uint8, uint16, uint32, uint64, uint128, uint256,\
     OperationNotSupported
 from remerkleable.bitfields import Bitvector, Bitlist
-from remerkleable.byte_arrays import ByteVector, Bytes1, Bytes4, Bytes8, Bytes32, Bytes48, Bytes96
+from remerkleable.byte_arrays import ByteVector, ByteList, Bytes1, Bytes4, Bytes8, Bytes32, Bytes48, Bytes96
 from remerkleable.core import BasicView, View
 from remerkleable.union import Union
+from remerkleable.readonly_iters import BitfieldIter
 from remerkleable.tree import get_depth, merkle_hash, LEFT_GINDEX, RIGHT_GINDEX
 
 
@@ -45,6 +47,10 @@ def test_basic_instances():
     assert isinstance(boolean(False), BasicView)
     assert isinstance(bit(True), boolean)
     assert isinstance(bit(False), boolean)
+    assert boolean(True) is boolean(1)
+    assert boolean(False) is boolean(0)
+    assert boolean(0.5) == 0  # not one of the shared values, converted by int
+    assert type(bit(True)) is bit
 
 
 def test_basic_value_bounds():
@@ -169,6 +175,29 @@ def test_container():
         pass
 
 
+def test_container_shadowed_field():
+    class Foo(Container):
+        a: uint64
+        copy: uint64  # type: ignore  # shadowed by the View.copy method
+
+    x = Foo(a=1, copy=2)
+    x.a = 3
+    x.copy = 4
+    assert x.a == 3
+    assert x.get(1) == 4
+    with pytest.raises(AttributeError, match="unknown attribute not_here"):
+        x.not_here = 5
+
+    class Bar(Container):
+        a: uint64
+        b: uint64 = None  # type: ignore  # a class attribute keeps precedence over the field, also when None
+
+    x = Bar(b=2)
+    x.b = 5
+    assert Bar.b is None
+    assert x.get(1) == 5
+
+
 def test_container_unpack():
     class Foo(Container):
         a: uint64
@@ -275,6 +304,18 @@ def test_uint_math():
     assert type(uint32(1234) + 56) == uint32
 
 
+def test_type_params_cached():
+    assert List[uint64, 10] is List[uint64, 10]
+    assert List[uint64, 10] is not List[uint64, 11]
+    assert Vector[uint8, 3] is Vector[uint8, 3]
+    assert Bitlist[7] is Bitlist[7]
+    assert Bitvector[7] is Bitvector[7]
+    assert ByteVector[5] is ByteVector[5]
+    assert Union[None, uint32] is Union[None, uint32]
+    assert List[uint64, 10]() == List[uint64, 10]()
+    assert Vector[uint8, 3]().get_backing() is Vector[uint8, 3]().get_backing()
+
+
 def test_container_depth():
     class SingleField(Container):
         foo: uint32
@@ -345,6 +386,8 @@ def test_paths():
 
     w = Wrapper(b=FourField(quix=42))
     assert (Wrapper / 'b' / 'quix').navigate_view(w) == 42
+    with pytest.raises(AttributeError, match="unknown attribute"):
+        w.navigate_view('not_here')
 
     assert (List[uint32, 123] / 0).navigate_type() == uint32
     assert (List[uint32, 123] / "__len__").navigate_type() == uint256
@@ -362,6 +405,15 @@ def test_paths():
     except KeyError:
         pass
 
+    assert (Bytes32 / 31).navigate_type() == byte
+    assert (ByteList[123] / 122).navigate_type() == byte
+    for typ, key in [(Bytes32, 32), (ByteList[123], 123)]:
+        try:
+            (typ / key).navigate_type()
+            assert False
+        except KeyError:
+            pass
+
 
 def test_bitvector():
     for size in [1, 2, 3, 4, 5, 6, 7, 8, 9, 15, 16, 17, 31, 32, 33, 63, 64, 65, 511, 512, 513, 1023, 1024, 1025]:
@@ -387,6 +439,16 @@ def test_bitvector_iter():
             assert bool(bit) == bools[i]
 
 
+def test_bitfield_repr():
+    rng = Random(123)
+    for size in [1, 7, 8, 9, 255, 256, 257, 1025]:
+        bools = list(rng.randint(0, 1) == 1 for i in range(size))
+        bitstr = ''.join('1' if bit else '0' for bit in bools)
+        assert repr(Bitvector[size](*bools)) == f"Bitvector[{size}]({bitstr})"
+        assert repr(Bitlist[1025](*bools)) == f"Bitlist[1025]({size} bits: {bitstr})"
+    assert repr(Bitlist[8]()) == "Bitlist[8](0 bits: )"
+
+
 def test_bitlist():
     for size in [1, 2, 3, 4, 5, 6, 7, 8, 9, 15, 16, 17, 31, 32, 33, 63, 64, 65, 511, 512, 513, 1023, 1024, 1025]:
         for i in range(size):
@@ -429,6 +491,96 @@ def test_bitlist_access():
     assert bf[len(bf)-1]
 
 
+def test_bitfield_count():
+    rng = Random(123)
+    for size in [1, 7, 8, 9, 255, 256, 257, 1025]:
+        bools = list(rng.randint(0, 1) == 1 for i in range(size))
+        for b in (Bitvector[size](*bools), Bitlist[1025](*bools)):
+            assert b.count(True) == b.count(1) == bools.count(True)
+            assert b.count(False) == b.count(0) == bools.count(False)
+            assert b.count(2) == 0
+    assert Bitlist[8]().count(True) == 0
+
+
+def test_bitfield_slice_set():
+    rng = Random(123)
+    for typ, length in [(Bitvector[7], 7), (Bitvector[600], 600), (Bitlist[1000], 600)]:
+        for start, end in [(0, 0), (0, length), (3, 5), (250, 260), (0, 256), (256, length), (length - 1, length)]:
+            bools = list(rng.randint(0, 1) == 1 for i in range(length))
+            start, end = min(start, length), min(end, length)
+            new_bools = list(rng.randint(0, 1) == 1 for i in range(end - start))
+            b = typ(*bools)
+            b[start:end] = new_bools
+            assert b.hash_tree_root() == typ(*(bools[:start] + new_bools + bools[end:])).hash_tree_root()
+        b = typ(*([False] * length))
+        with pytest.raises(Exception):
+            b[0:3] = [True]
+        # negative and open slice bounds count from the end, like list slices
+        b[-2:] = [True, True]
+        b[:-(length - 1)] = [True]
+        assert list(b) == [True] + [False] * (length - 3) + [True, True]
+        with pytest.raises(IndexError):
+            b[length - 1:length + 1] = [True, True]
+        with pytest.raises(IndexError):
+            b[-(length + 1):] = [False] * (length + 1)
+        with pytest.raises(IndexError):
+            b[3:2] = []
+
+
+def test_bitlist_extend():
+    rng = Random(123)
+    typ = Bitlist[1000]
+    for start, count in [(0, 0), (0, 1), (0, 300), (1, 4), (3, 253), (100, 200), (256, 256), (257, 743), (0, 1000)]:
+        bools = list(rng.randint(0, 1) == 1 for i in range(start + count))
+        b = typ(*bools[:start])
+        b.extend(bools[start:])
+        assert b.length() == start + count
+        assert b.hash_tree_root() == typ(*bools).hash_tree_root()
+
+    # extending after pops, into previously summarized parts of the tree
+    bools = list(rng.randint(0, 1) == 1 for i in range(900))
+    b = typ(*bools)
+    for i in range(700):
+        b.pop()
+    b.extend(bools[200:])
+    assert b.hash_tree_root() == typ(*bools).hash_tree_root()
+
+    with pytest.raises(Exception):
+        b.extend([True] * 101)
+    assert b.length() == 900
+
+
+def test_bitlist_pop():
+    for length in [1, 2, 9, 255, 256, 257, 300]:
+        bools = [True] * length
+        b = Bitlist[1000](*bools)
+        b.pop()
+        # the popped bit is cleared from the chunk, so the root matches a fresh bitlist of the same bits
+        assert b.length() == length - 1
+        assert b.hash_tree_root() == Bitlist[1000](*bools[:-1]).hash_tree_root()
+        b.append(False)
+        assert b.length() == length
+        assert b.hash_tree_root() == Bitlist[1000](*(bools[:-1] + [False])).hash_tree_root()
+
+
+def test_bitfield_encode_bytes():
+    rng = Random(123)
+    for length in [0, 1, 7, 8, 9, 255, 256, 257, 300, 512, 1000]:
+        bools = list(rng.randint(0, 1) == 1 for i in range(length))
+        packed = sum(1 << i for i, bit in enumerate(bools) if bit)
+        expected = packed.to_bytes((length + 7) // 8, byteorder='little')
+        if length > 0:
+            assert Bitvector[length](*bools).encode_bytes() == expected
+        bitlist_expected = (packed | (1 << length)).to_bytes(length // 8 + 1, byteorder='little')
+        b = Bitlist[1000](*bools)
+        assert b.encode_bytes() == bitlist_expected
+        assert Bitlist[1000].decode_bytes(bitlist_expected) == b
+        assert list(BitfieldIter(b.get_backing().get_left(), b.contents_depth(), length)) == bools
+        if length > 0:
+            v = Bitvector[length](*bools)
+            assert list(BitfieldIter(v.get_backing(), v.tree_depth(), length)) == bools
+
+
 def test_container_inheritance():
     class Foo(Container):
         a: uint64
@@ -443,6 +595,19 @@ def test_container_inheritance():
     assert Bar._field_indices == {'a': 0, 'b': 1, 'c': 2}
 
     foo = Foo(a=0xaabbccdd11223344, b=0x55667788)
+    # container types keep an instance dict and weak references, unless they declare empty slots themselves
+    assert vars(foo) == {}
+    assert weakref.ref(foo)() is foo
+    with pytest.raises(AttributeError, match="unknown attribute"):
+        foo.not_here = 1
+
+    class Slotted(Container):
+        __slots__ = ()
+        a: uint64
+
+    assert not hasattr(Slotted(), '__dict__')
+    with pytest.raises(AttributeError, match="unknown attribute"):
+        Slotted().not_here = 1
     assert foo.encode_bytes().hex() == "44332211ddccbbaa88776655"  # little endian!
     bar = Bar(c=0x99)
     assert bar.encode_bytes().hex() == "00000000000000000000000099"  # inits missing fields still
@@ -456,6 +621,9 @@ def test_container_inheritance():
     assert ChocoBar._field_indices == {'a': 0, 'b': 1, 'c': 2, 'aa': 3}
     cb = ChocoBar(a=0xaabbccdd11223344, b=0x55667788, c=0xaf, aa=0x0102030405060708)
     assert cb.encode_bytes().hex() == "44332211ddccbbaa88776655af0807060504030201"
+    # the default node is built once per type, not inherited by the subclasses
+    assert Bar.default_node() is Bar.default_node()
+    assert ChocoBar.default_node().merkle_root() == ChocoBar.decode_bytes(bytes(21)).hash_tree_root()
 
     # multiple inheritance
 
@@ -601,3 +769,146 @@ def test_union():
     assert gindex_test_typ.key_to_static_gindex('__selector__') == RIGHT_GINDEX
     assert gindex_test_typ.key_to_static_gindex(0) == LEFT_GINDEX
     assert gindex_test_typ.key_to_static_gindex(1) == LEFT_GINDEX
+
+
+def test_rehash_modified_path_only(monkeypatch):
+    import remerkleable.tree
+    hash_count = 0
+    inner_hash = remerkleable.tree.merkle_hash
+
+    def counting_hash(a, b):
+        nonlocal hash_count
+        hash_count += 1
+        return inner_hash(a, b)
+
+    monkeypatch.setattr(remerkleable.tree, 'merkle_hash', counting_hash)
+
+    typ = List[uint64, 1 << 20]
+    x = typ(list(range(1000)))
+    first_root = x.hash_tree_root()
+    assert hash_count > 1000 // 4
+    hash_count = 0
+    x[123] = 42
+    second_root = x.hash_tree_root()
+    # Only the nodes from the modified chunk up to the root (incl. the length mix-in) are rehashed.
+    assert hash_count == typ.tree_depth()
+    assert first_root != second_root
+    hash_count = 0
+    assert x.hash_tree_root() == second_root
+    assert hash_count == 0
+
+
+@pytest.mark.parametrize("elem_typ, make", [
+    (uint16, lambda i: uint16(i)),
+    (uint256, lambda i: uint256(i)),
+    (boolean, lambda i: boolean(i & 1)),
+    (Bytes32, lambda i: Bytes32(bytes([i & 0xff]) * 32)),  # type: ignore
+    (Vector[uint8, 3], lambda i: Vector[uint8, 3](i & 0xff, 1, 2)),  # type: ignore
+])
+def test_list_extend(elem_typ, make):
+    typ = List[elem_typ, 300]
+    for start, count in [(0, 0), (0, 1), (0, 5), (1, 4), (3, 13), (16, 16), (17, 100), (40, 260), (0, 300)]:
+        expected = typ(*[make(i) for i in range(start)])
+        x = typ(*[make(i) for i in range(start)])
+        for i in range(start, start + count):
+            expected.append(make(i))
+        x.extend(make(i) for i in range(start, start + count))
+        assert x.length() == start + count
+        assert x.hash_tree_root() == expected.hash_tree_root()
+        assert x.encode_bytes() == expected.encode_bytes()
+
+    # extending after pops, into previously summarized parts of the tree
+    x = typ(*[make(i) for i in range(100)])
+    for i in range(60):
+        x.pop()
+    x.extend(make(i) for i in range(40, 140))
+    assert x.hash_tree_root() == typ(*[make(i) for i in range(140)]).hash_tree_root()
+
+    with pytest.raises(Exception):
+        x.extend(make(i) for i in range(161))
+    assert x.length() == 140
+
+
+def test_list_length_cache():
+    typ = List[uint64, 100]
+    x = typ(1, 2, 3)
+    assert x.length() == 3
+    x.append(uint64(4))
+    assert x.length() == 4
+    x.pop()
+    assert x.length() == 3
+    # replacing the backing resets the cached length
+    x.set_backing(typ(5, 6, 7, 8, 9).get_backing())
+    assert x.length() == 5
+    assert list(x) == [5, 6, 7, 8, 9]
+    with pytest.raises(IndexError):
+        x[5]
+
+
+@pytest.mark.parametrize("seq_typ, elem_typ, n", [(List, uint64, 100), (List, uint16, 100), (List, uint256, 10),
+                                                  (Vector, uint32, 20), (Vector, uint8, 33)])
+def test_packed_decode_bytes(seq_typ, elem_typ, n):
+    typ = seq_typ[elem_typ, n]
+    count = n if seq_typ is Vector else 9
+    values = [elem_typ((i * 0x0123456789abcdef) % (1 << (8 * elem_typ.type_byte_length()))) for i in range(count)]
+    x = typ(*values)
+    decoded = typ.decode_bytes(x.encode_bytes())
+    assert list(decoded) == values
+    assert decoded.hash_tree_root() == x.hash_tree_root()
+    with pytest.raises(Exception):
+        typ.decode_bytes(x.encode_bytes()[:-1])
+    if seq_typ is List:
+        assert typ.decode_bytes(b"") == typ()
+
+
+@pytest.mark.parametrize("seq_typ, elem_typ, n", [(List, uint64, 100), (List, uint16, 33), (List, uint8, 70),
+                                                  (List, boolean, 300), (List, uint128, 20), (Vector, uint32, 21)])
+def test_packed_count(seq_typ, elem_typ, n):
+    typ = seq_typ[elem_typ, n]
+    values = [elem_typ(i % 2 if elem_typ is boolean else i % 5) for i in range(n if seq_typ is Vector else n - 3)]
+    x = typ(*values)
+    for v in (0, 1, 4, 5, elem_typ(1), True, "1"):
+        assert x.count(v) == values.count(v)
+    assert x.encode_bytes() == b"".join(v.encode_bytes() for v in values)
+
+
+@pytest.mark.parametrize("seq_typ, n", [(List, 100), (List, 32), (Vector, 33), (Vector, 1)])
+def test_uint8_seq_from_bytes(seq_typ, n):
+    typ = seq_typ[uint8, n]
+    raw = bytes((i * 7) % 256 for i in range(33 if n > 32 else n))
+    x = typ(raw)
+    assert list(x) == list(raw)
+    assert x.hash_tree_root() == typ(*raw).hash_tree_root()
+    assert typ("0x" + raw.hex()) == x
+    with pytest.raises(Exception):
+        typ(raw + raw * n)
+    if seq_typ is List:
+        assert typ(b"") == typ()
+
+
+@pytest.mark.parametrize("seq_typ, params, make", [(List, (uint64, 1000), uint64), (List, (uint16, 33), uint16),
+                                                   (List, (Bytes32, 100), lambda i: i.to_bytes(32, 'little')),
+                                                   (List, (boolean, 100), lambda i: i % 2 == 0),
+                                                   (List, (uint256, 100), uint256),
+                                                   (Bitlist, 1000, lambda i: i % 3 == 0)])
+def test_list_append_pop(seq_typ, params, make):
+    typ = seq_typ[params]
+    rng = Random(123)
+    x = typ()
+    expected = []
+    for step in range(600):
+        if len(expected) > 0 and (rng.randint(0, 2) == 0 or len(expected) == typ.limit()):
+            x.pop()
+            expected.pop()
+        else:
+            v = make(rng.randint(1, 1000))
+            x.append(v)
+            expected.append(v)
+        assert x.length() == len(expected)
+        if step % 20 == 0:
+            assert x.hash_tree_root() == typ(*expected).hash_tree_root()
+            assert list(x) == expected
+    while len(expected) > 0:
+        x.pop()
+        expected.pop()
+    assert x.hash_tree_root() == typ().hash_tree_root()
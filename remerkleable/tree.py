@@ -70,15 +70,15 @@ class Node(Protocol):
     def getter(self, target: Gindex) -> "Node":
         if target < 1:
             raise NavigationError
-        if target == 1:
-            return self
         node = self
-        bit_iter, _ = gindex_bit_iter(target)
-        for bit in bit_iter:
-            if bit:
+        # walk the bits of the gindex, from the first bit below the anchor bit, down to the last bit.
+        shift = target.bit_length() - 2
+        while shift >= 0:
+            if (target >> shift) & 1:
                 node = node.get_right()
             else:
                 node = node.get_left()
+            shift -= 1
         return node
 
     def is_leaf(self) -> bool:
@@ -107,7 +107,7 @@ class Node(Protocol):
 
 
 def zero_node(depth: int) -> "RootNode":
-    return RootNode(zero_hashes[depth])
+    return zero_nodes[depth]
 
 
 def identity(v: Node) -> Node:
@@ -146,29 +146,34 @@ class RebindableNode(Node):
             return self.rebind_left
         if target == 3:
             return self.rebind_right
-        bit_iter, depth = gindex_bit_iter(target)
-        first = bit_iter.__next__()
-        link = self.rebind_right if first else self.rebind_left
-        prev_bit = first
+        # Collect the parent nodes along the path to the target, top to bottom.
+        path: List[Node] = [self]
         node: Node = self
-        for bit in bit_iter:
-            if prev_bit:
+        shift = target.bit_length() - 2
+        while shift > 0:
+            if (target >> shift) & 1:
                 node = node.get_right()
             else:
                 node = node.get_left()
-            depth -= 1
             if node.is_leaf():
                 if not expand:
                     raise NavigationError
-                child = zero_node(depth - 1)
+                # the node is expected to be a zero node, with the remaining path length as height.
+                child = zero_node(shift - 1)
                 node = self.combine(child, child)
-            # Ignored typing, since the rebind methods are `Callable[[Arg(Node, 'v')], Node]` (mypy specific)
-            # instead of `Callable[[Node], Node]` (aka `Link`)
-            if bit:
-                link = compose(node.rebind_right, link)  # type: ignore
-            else:
-                link = compose(node.rebind_left, link)  # type: ignore
-            prev_bit = bit
+            path.append(node)
+            shift -= 1
+
+        def link(v: Node) -> Node:
+            # rebind the path bottom to top, the last parent is selected by the last gindex bit.
+            bit_shift = 0
+            for parent in reversed(path):
+                if (target >> bit_shift) & 1:
+                    v = parent.rebind_right(v)
+                else:
+                    v = parent.rebind_left(v)
+                bit_shift += 1
+            return v
         return link
 
 
@@ -244,23 +249,65 @@ def subtree_fill_to_contents(nodes: List[Node], depth: int) -> Node:
         return zero_node(depth)
     if len(nodes) > (1 << depth):
         raise Exception("too many nodes")
-    if depth == 0:
-        if len(nodes) == 1:
-            return nodes[0]
-        else:
-            raise NavigationError
-    if depth == 1:
-        return PairNode(nodes[0], nodes[1] if len(nodes) > 1 else zero_node(0))
-    else:
-        anchor = 1 << depth
-        pivot = anchor >> 1
-        if len(nodes) <= pivot:
-            return PairNode(subtree_fill_to_contents(nodes, depth - 1), zero_node(depth - 1))
-        else:
-            return PairNode(
-                subtree_fill_to_contents(nodes[:pivot], depth-1),
-                subtree_fill_to_contents(nodes[pivot:], depth-1)
-            )
+    # Fold the nodes bottom-up, one layer at a time, padding odd layers with a zero node of the same height.
+    # This avoids the recursive list slicing, and keeps the work linear in the number of nodes.
+    layer = nodes
+    for i in range(depth):
+        count = len(layer)
+        next_layer: List[Node] = [PairNode(layer[j], layer[j + 1]) for j in range(0, count - 1, 2)]
+        if count & 1:
+            next_layer.append(PairNode(layer[count - 1], zero_node(i)))
+        layer = next_layer
+    return layer[0]
+
+
+def subtree_bottom_nodes(anchor: Node, depth: int, count: int) -> List[Node]:
+    """Get the first count bottom nodes of the subtree of the given depth, left to right.
+     The subtree is traversed once, layer by layer, instead of navigating from the anchor for every bottom node."""
+    if count == 0:
+        return []
+    if count == 1:
+        return [anchor.getter(Gindex(1 << depth))]
+    nodes: List[Node] = [anchor]
+    for i in range(depth - 1, -1, -1):
+        needed = (count + (1 << i) - 1) >> i
+        next_nodes: List[Node] = []
+        for node in nodes:
+            next_nodes.append(node.get_left())
+            next_nodes.append(node.get_right())
+        nodes = next_nodes[:needed]
+    return nodes[:count]
+
+
+def subtree_fill_from(anchor: Node, depth: int, start: int, nodes: List[Node]) -> Node:
+    """Set the given nodes at the bottom of the subtree of the given depth, starting at index start.
+     The bottom nodes from start onwards are expected to be zero, e.g. the unused part of a list.
+     Each aligned power-of-two run of nodes is built bottom-up, and then attached with a single setter."""
+    node = anchor
+    i = start
+    pos = 0
+    while pos < len(nodes):
+        remaining = len(nodes) - pos
+        # the largest subtree that is aligned at i, but not larger than necessary to hold the remaining nodes.
+        # Positions past the end are zero, and so is the padding of the subtree.
+        j = depth if i == 0 else min((i & -i).bit_length() - 1, depth)
+        while j > 0 and (1 << (j - 1)) >= remaining:
+            j -= 1
+        count = min(1 << j, remaining)
+        subtree = subtree_fill_to_contents(nodes[pos:pos + count], j)
+        target = to_gindex(i >> j, depth - j)
+        try:
+            set_subtree = node.setter(target)
+        except NavigationError:
+            # Expanding a summarized part of the tree only works towards a bottom node,
+            # since the height of the zero nodes to expand with is derived from the target depth.
+            # So first expand the path to the first bottom node, which is zero, then set the subtree.
+            node = node.setter(to_gindex(i, depth), expand=True)(zero_node(0))
+            set_subtree = node.setter(target)
+        node = set_subtree(subtree)
+        i += count
+        pos += count
+    return node
 
 
 class RootNode(Node):
@@ -305,6 +352,10 @@ class RootNode(Node):
         return f"0x{self._root.hex()}"
 
 
+# Root nodes are immutable, so the zero nodes can be created once, and shared between all trees.
+zero_nodes: List[RootNode] = [RootNode(root) for root in zero_hashes]
+
+
 def leaf_iter(node: Node) -> Iterator[Node]:
     """Iterate ove the leaf nodes of the given node. Left-to-right order."""
     if node.is_leaf():
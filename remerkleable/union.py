@@ -1,6 +1,7 @@
 from typing import cast, Sequence, Any, BinaryIO, Optional, TypeVar, Type, Union as PyUnion
 from textwrap import indent
 import io
+from functools import lru_cache
 from remerkleable.core import View, BackedView, ViewHook, ObjType
 from remerkleable.basic import uint256
 from remerkleable.tree import Node, zero_node, Gindex, PairNode
@@ -59,6 +60,8 @@ class Union(BackedView):
             right=uint256(selector).get_backing())
         return super().__new__(cls, backing=backing, hook=hook, **kwargs)
 
+    @classmethod
+    @lru_cache(maxsize=None)
     def __class_getitem__(cls, union_options) -> Type["Union"]:
         if not isinstance(union_options, tuple):  # single-element arguments are not passed as single-element tuple.
             union_options = (union_options,)
@@ -82,6 +85,8 @@ class Union(BackedView):
             raise TypeError("Union with a None option must have at least 2 options")
 
         class SpecialUnionView(Union):
+            __slots__ = ()
+
             @classmethod
             def options(cls) -> Options:
                 return union_options_list